@@ -5,19 +5,134 @@ from __future__ import annotations
 import logging
 from datetime import timedelta
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+import homeassistant.helpers.config_validation as cv
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS, SERVICE_SYNC_NOW, CONF_INTERVAL_SECONDS, DEFAULT_INTERVAL_SECONDS
+from .const import (
+    ATTR_CONCURRENCY,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_DRAIN,
+    ATTR_DRY_RUN,
+    ATTR_MAX_ITEMS,
+    ATTR_PATH,
+    ATTR_SCAN_PATHS,
+    CONF_INTERVAL_SECONDS,
+    DEFAULT_INTERVAL_SECONDS,
+    DEFAULT_PROFILE_CYCLES,
+    DOMAIN,
+    MAX_PROFILE_CYCLES,
+    MAX_SYNC_CONCURRENCY,
+    PLATFORMS,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRACE,
+    SERVICE_SYNC_NOW,
+)
 from .coordinator import DoxiePaperlessCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+SYNC_NOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SCAN_PATHS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_ITEMS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SYNC_CONCURRENCY)
+        ),
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+        vol.Optional(ATTR_DRAIN, default=False): cv.boolean,
+    }
+)
+
+# Shared by the profile and record_trace services.
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> DoxiePaperlessCoordinator:
+    """Coordinator addressed by a service call (`config_entry_id`, or the only entry)."""
+    coordinators = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, DoxiePaperlessCoordinator)
+    }
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id:
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"Unknown or not loaded config entry: {entry_id}")
+        return coordinators[entry_id]
+    if len(coordinators) != 1:
+        raise ServiceValidationError(
+            f"{ATTR_CONFIG_ENTRY_ID} is required when {len(coordinators)} Doxie entries are loaded"
+        )
+    return next(iter(coordinators.values()))
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up integration (YAML not supported; config flow only)."""
+
+    async def _handle_sync_now(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        res = await coordinator.async_sync_batch(
+            scan_paths=call.data.get(ATTR_SCAN_PATHS),
+            max_items=call.data.get(ATTR_MAX_ITEMS),
+            concurrency=call.data.get(ATTR_CONCURRENCY),
+            dry_run=call.data[ATTR_DRY_RUN],
+            drain=call.data[ATTR_DRAIN],
+        )
+        _LOGGER.info(
+            "Manual sync result: %s processed, %s failed in %ss",
+            res["processed"],
+            res["failed"],
+            res["duration"],
+        )
+        _LOGGER.debug("Manual sync items: %s", res["items"])
+        # Refresh sensors after manual sync
+        await coordinator.async_request_refresh()
+        if call.return_response:
+            return res
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SYNC_NOW,
+        _handle_sync_now,
+        schema=SYNC_NOW_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_profile(call: ServiceCall) -> None:
+        _get_coordinator(hass, call).async_start_profile(call.data[ATTR_CYCLES])
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _handle_profile, schema=PROFILE_SCHEMA)
+
+    async def _handle_record_trace(call: ServiceCall) -> ServiceResponse:
+        path = _get_coordinator(hass, call).async_start_recording(call.data[ATTR_CYCLES])
+        if call.return_response:
+            return {ATTR_PATH: str(path)}
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRACE,
+        _handle_record_trace,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     return True
 
 
@@ -27,14 +142,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    async def _handle_sync_now(call: ServiceCall) -> None:
-        res = await coordinator.async_sync_once()
-        _LOGGER.info("Manual sync result: %s", res)
-        # Refresh sensors after manual sync
-        await coordinator.async_request_refresh()
-
-    hass.services.async_register(DOMAIN, SERVICE_SYNC_NOW, _handle_sync_now)
-
     # Periodic sync worker (independent from coordinator polling for sensors)
     interval = int(({**entry.data, **entry.options}).get(CONF_INTERVAL_SECONDS, DEFAULT_INTERVAL_SECONDS))
 
@@ -58,5 +165,5 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if unsub:
             unsub()
         hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-        # NOTE: not unregistering service, as HA services are global and we might have multiple entries.
+        # Services are registered once in async_setup and shared by all entries.
     return unload_ok
@@ -0,0 +1,157 @@
+"""AIMD concurrency control for requests to the Doxie.
+
+The Doxie's embedded HTTP server slows down sharply when it gets too many
+parallel requests. The controller watches the per-request timings of
+DoxieClient: every request counts towards the error rate, while latency is
+judged from scan downloads only (JSON polls are far faster than any
+download over the Doxie's Wi-Fi and would skew the baseline). Only failures
+that point at an overloaded device count as errors: connection errors,
+timeouts and 5xx responses. 4xx responses (e.g. an unknown scan path) and
+cancelled requests say nothing about load. While latency and error rate stay
+healthy it allows one more download in flight per evaluation window
+(additive increase); on errors or latency well above the observed baseline
+it halves the limit (multiplicative decrease).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+
+from .timing import RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+# Download cost is the duration per COST_UNIT bytes, so scans of different
+# sizes compare fairly.
+COST_UNIT = 256 * 1024
+EWMA_ALPHA = 0.3
+# Latency is "unhealthy" above this multiple of the baseline.
+LATENCY_TOLERANCE = 2.0
+MAX_ERROR_RATE = 0.1
+MIN_WINDOW = 4
+BASELINE_SAMPLES = 100
+
+
+def _is_download(timing: RequestTiming) -> bool:
+    """GET /scans{path} (scan download), as opposed to the *.json endpoints."""
+    return timing.method == "GET" and timing.path.startswith("/scans/") and not timing.path.endswith(".json")
+
+
+def _is_overload(timing: RequestTiming) -> bool:
+    """5xx response, or no response at all (connection error or timeout)."""
+    if timing.status is not None:
+        return timing.status >= 500
+    return timing.error is not None
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit adjusted from observed Doxie latency and errors."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self._limit = min_limit
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+        self._ewma: float | None = None
+        self._recent_costs: deque[float] = deque(maxlen=BASELINE_SAMPLES)
+        self._window_samples = 0
+        self._window_errors = 0
+        self._window_downloads = 0
+        self._window_saturated = False
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def latency(self) -> float | None:
+        """Smoothed download cost in seconds per COST_UNIT."""
+        return self._ewma
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the currently allowed slots."""
+        while self._in_flight >= self._limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # Pass on a wake-up this waiter may already have consumed.
+                self._wake()
+                raise
+        self._in_flight += 1
+        if self._in_flight >= self._limit:
+            self._window_saturated = True
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        free = self._limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def observe(self, timing: RequestTiming) -> None:
+        """Feed one DoxieClient request timing (RequestTimer listener)."""
+        if timing.error == "CancelledError":
+            # Cut short by the caller (e.g. the probe's time budget).
+            return
+        failed = _is_overload(timing)
+        if failed:
+            self._window_errors += 1
+        elif timing.error is None and _is_download(timing):
+            self._window_downloads += 1
+            cost = timing.duration / max(1.0, (timing.size or 0) / COST_UNIT)
+            self._recent_costs.append(cost)
+            self._ewma = cost if self._ewma is None else EWMA_ALPHA * cost + (1 - EWMA_ALPHA) * self._ewma
+        self._window_samples += 1
+
+        if self._window_samples < max(MIN_WINDOW, self._limit):
+            # Errors still cut back right away.
+            if failed and self._window_errors / self._window_samples > MAX_ERROR_RATE:
+                self._decrease("errors")
+            return
+
+        error_rate = self._window_errors / self._window_samples
+        baseline = min(self._recent_costs) if self._recent_costs else None
+        if error_rate > MAX_ERROR_RATE:
+            self._decrease("errors")
+        elif self._ewma is not None and baseline and self._ewma > baseline * LATENCY_TOLERANCE:
+            self._decrease("latency")
+        elif self._window_downloads and self._window_saturated and self._limit < self.max_limit:
+            # Only grow when the current limit is actually in use.
+            self._limit += 1
+            _LOGGER.debug("Doxie concurrency raised to %s", self._limit)
+            self._wake()
+        self._reset_window()
+
+    def _decrease(self, reason: str) -> None:
+        new_limit = max(self.min_limit, self._limit // 2)
+        if new_limit != self._limit:
+            _LOGGER.debug("Doxie concurrency cut to %s (%s)", new_limit, reason)
+        self._limit = new_limit
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_samples = 0
+        self._window_errors = 0
+        self._window_downloads = 0
+        self._window_saturated = self._in_flight >= self._limit
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+
+from aiohttp import ClientError, ClientResponseError
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
     BooleanSelector,
     NumberSelector,
@@ -16,6 +22,7 @@ from homeassistant.helpers.selector import (
 
 from .const import (
     DOMAIN,
+    MAX_SYNC_CONCURRENCY,
     # Doxie
     CONF_DOXIE_HOST,
     CONF_DOXIE_PORT,
@@ -25,11 +32,24 @@ from .const import (
     CONF_MODE,
     MODE_PAPERLESS,
     MODE_CONSUME_DIR,
+    CONF_DESTINATIONS,
+    CONF_SUCCESS_POLICY,
+    POLICY_ALL,
+    POLICY_ANY,
     # Paperless
     CONF_PAPERLESS_URL,
     CONF_PAPERLESS_TOKEN,
     CONF_PAPERLESS_USERNAME,
     CONF_PAPERLESS_PASSWORD,
+    CONF_PAPERLESS_TAGS,
+    CONF_PAPERLESS_CORRESPONDENT,
+    CONF_PAPERLESS_DOCUMENT_TYPE,
+    CONF_PAPERLESS_STORAGE_PATH,
+    CONF_METADATA_CACHE_TTL,
+    DEFAULT_METADATA_CACHE_TTL,
+    CONF_UPLOAD_RATE_LIMIT,
+    CONF_UPLOAD_RATE_PROFILES,
+    DEFAULT_UPLOAD_RATE_LIMIT,
     # Consume
     CONF_CONSUME_DIR,
     # Behaviour
@@ -37,7 +57,42 @@ from .const import (
     CONF_DELETE_ON_SUCCESS,
     CONF_WAIT_FOR_TASK,
     DEFAULT_INTERVAL_SECONDS,
+    CONF_MAX_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    CONF_TIMEOUT_SECONDS,
+    DEFAULT_TIMEOUT_SECONDS,
 )
+from .doxie_api import DoxieClient
+from .helpers import get_destinations
+from .paperless_api import PaperlessClient
+from .probe import PAPERLESS_TIMEOUT, LinkProbe, async_probe_link
+from .ratelimit import parse_profiles
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _tuning_schema(defaults: dict) -> dict:
+    """Interval/concurrency/timeout fields; `defaults` uses LinkProbe.recommend() keys."""
+    return {
+        vol.Optional(
+            CONF_INTERVAL_SECONDS,
+            default=int(defaults.get("interval", DEFAULT_INTERVAL_SECONDS)),
+        ): NumberSelector(
+            NumberSelectorConfig(min=10, max=86400, mode="box")
+        ),
+        vol.Optional(
+            CONF_MAX_CONCURRENCY,
+            default=int(defaults.get("concurrency", DEFAULT_MAX_CONCURRENCY)),
+        ): NumberSelector(
+            NumberSelectorConfig(min=1, max=MAX_SYNC_CONCURRENCY, mode="box")
+        ),
+        vol.Optional(
+            CONF_TIMEOUT_SECONDS,
+            default=int(defaults.get("timeout", DEFAULT_TIMEOUT_SECONDS)),
+        ): NumberSelector(
+            NumberSelectorConfig(min=5, max=3600, mode="box")
+        ),
+    }
 
 
 class QDoxieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -47,62 +102,103 @@ class QDoxieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         self._base_data: dict = {}
+        self._probe: LinkProbe | None = None
 
     async def async_step_user(self, user_input=None):
         """Step 1: Doxie connection + mode selection."""
-        if user_input is None:
-            return self.async_show_form(
-                step_id="user",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(CONF_DOXIE_HOST): TextSelector(),
-                        vol.Optional(
-                            CONF_DOXIE_PORT,
-                            default=DEFAULT_DOXIE_PORT,
-                        ): NumberSelector(
-                            NumberSelectorConfig(min=1, max=65535, mode="box")
-                        ),
-                        vol.Optional(CONF_DOXIE_PASSWORD): TextSelector(),
-                        vol.Required(CONF_MODE): SelectSelector(
-                            SelectSelectorConfig(
-                                options=[MODE_PAPERLESS, MODE_CONSUME_DIR],
-                                mode="dropdown",
-                            )
-                        ),
-                    }
+        errors: dict[str, str] = {}
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_DOXIE_HOST): TextSelector(),
+                vol.Optional(
+                    CONF_DOXIE_PORT,
+                    default=DEFAULT_DOXIE_PORT,
+                ): NumberSelector(
+                    NumberSelectorConfig(min=1, max=65535, mode="box")
                 ),
-            )
+                vol.Optional(CONF_DOXIE_PASSWORD): TextSelector(),
+                vol.Required(CONF_MODE): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[MODE_PAPERLESS, MODE_CONSUME_DIR],
+                        mode="dropdown",
+                    )
+                ),
+            }
+        )
 
-        self._base_data = user_input
+        if user_input is not None:
+            await self.async_set_unique_id(user_input[CONF_DOXIE_HOST])
+            self._abort_if_unique_id_configured()
 
-        if user_input[CONF_MODE] == MODE_PAPERLESS:
-            return await self.async_step_paperless()
+            doxie = DoxieClient(
+                async_get_clientsession(self.hass),
+                host=user_input[CONF_DOXIE_HOST],
+                port=int(user_input.get(CONF_DOXIE_PORT, DEFAULT_DOXIE_PORT)),
+                password=user_input.get(CONF_DOXIE_PASSWORD) or None,
+            )
+            try:
+                self._probe = await async_probe_link(doxie)
+            except ClientResponseError as err:
+                errors["base"] = "invalid_auth" if err.status in (401, 403) else "cannot_connect"
+            except (ClientError, TimeoutError, ValueError):
+                # ValueError: hello.json answered with something that isn't JSON.
+                errors["base"] = "cannot_connect"
+
+            if not errors:
+                self._base_data = user_input
+                if user_input[CONF_MODE] == MODE_PAPERLESS:
+                    return await self.async_step_paperless()
+                return await self.async_step_consume_dir()
 
-        return await self.async_step_consume_dir()
+        return self.async_show_form(
+            step_id="user",
+            data_schema=self.add_suggested_values_to_schema(schema, user_input or {}),
+            errors=errors,
+        )
 
     async def async_step_paperless(self, user_input=None):
         """Step 2a: Paperless configuration."""
-        if user_input is None:
-            return self.async_show_form(
-                step_id="paperless",
-                data_schema=vol.Schema(
-                    {
-                        vol.Required(CONF_PAPERLESS_URL): TextSelector(),
-                        vol.Optional(CONF_PAPERLESS_TOKEN): TextSelector(),
-                        vol.Optional(CONF_PAPERLESS_USERNAME): TextSelector(),
-                        vol.Optional(CONF_PAPERLESS_PASSWORD): TextSelector(),
-                    }
-                ),
-            )
+        errors: dict[str, str] = {}
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_PAPERLESS_URL): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_TOKEN): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_USERNAME): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_PASSWORD): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_TAGS): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_CORRESPONDENT): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_DOCUMENT_TYPE): TextSelector(),
+                vol.Optional(CONF_PAPERLESS_STORAGE_PATH): TextSelector(),
+            }
+        )
 
-        data = {**self._base_data, **user_input}
+        if user_input is not None:
+            paperless = PaperlessClient(
+                async_get_clientsession(self.hass),
+                base_url=str(user_input[CONF_PAPERLESS_URL]),
+                token=user_input.get(CONF_PAPERLESS_TOKEN) or None,
+                username=user_input.get(CONF_PAPERLESS_USERNAME) or None,
+                password=user_input.get(CONF_PAPERLESS_PASSWORD) or None,
+            )
+            start = time.monotonic()
+            try:
+                async with asyncio.timeout(PAPERLESS_TIMEOUT):
+                    await paperless.ping()
+            except ClientResponseError as err:
+                errors["base"] = "invalid_auth" if err.status in (401, 403) else "cannot_connect"
+            except (ClientError, TimeoutError):
+                errors["base"] = "cannot_connect"
 
-        await self.async_set_unique_id(data[CONF_DOXIE_HOST])
-        self._abort_if_unique_id_configured()
+            if not errors:
+                if self._probe:
+                    self._probe.paperless_latency = time.monotonic() - start
+                self._base_data = {**self._base_data, **user_input}
+                return await self.async_step_tuning()
 
-        return self.async_create_entry(
-            title=f"Doxie {data[CONF_DOXIE_HOST]}",
-            data=data,
+        return self.async_show_form(
+            step_id="paperless",
+            data_schema=self.add_suggested_values_to_schema(schema, user_input or {}),
+            errors=errors,
         )
 
     async def async_step_consume_dir(self, user_input=None):
@@ -117,14 +213,21 @@ class QDoxieConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 ),
             )
 
-        data = {**self._base_data, **user_input}
+        self._base_data = {**self._base_data, **user_input}
+        return await self.async_step_tuning()
 
-        await self.async_set_unique_id(data[CONF_DOXIE_HOST])
-        self._abort_if_unique_id_configured()
+    async def async_step_tuning(self, user_input=None):
+        """Step 3: polling/concurrency/timeout, pre-filled from the link probe."""
+        if user_input is not None:
+            data = {**self._base_data, **user_input}
+            return self.async_create_entry(
+                title=f"Doxie {data[CONF_DOXIE_HOST]}",
+                data=data,
+            )
 
-        return self.async_create_entry(
-            title=f"Doxie {data[CONF_DOXIE_HOST]}",
-            data=data,
+        return self.async_show_form(
+            step_id="tuning",
+            data_schema=vol.Schema(_tuning_schema(self._probe.recommend() if self._probe else {})),
         )
 
     @staticmethod
@@ -137,21 +240,35 @@ class QDoxieOptionsFlow(config_entries.OptionsFlow):
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self.config_entry = config_entry
+        self._options: dict = {}
 
     async def async_step_init(self, user_input=None):
+        """Step 1: behaviour and destinations."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            self._options = user_input
+            return await self.async_step_destinations()
 
         current = {**self.config_entry.data, **self.config_entry.options}
-        mode = current.get(CONF_MODE, MODE_PAPERLESS)
+
+        # Saved tuning values always win. Only when some were never set (entries
+        # created before the tuning step) is the link probed to fill the gaps.
+        tuning_keys = {
+            "interval": CONF_INTERVAL_SECONDS,
+            "concurrency": CONF_MAX_CONCURRENCY,
+            "timeout": CONF_TIMEOUT_SECONDS,
+        }
+        tuning = {name: current[key] for name, key in tuning_keys.items() if key in current}
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if len(tuning) < len(tuning_keys) and coordinator:
+            try:
+                probe = await async_probe_link(coordinator.doxie, coordinator.paperless)
+            except (ClientError, TimeoutError, ValueError) as err:
+                _LOGGER.debug("Link probe failed: %s", err)
+            else:
+                tuning = {**probe.recommend(), **tuning}
 
         schema = {
-            vol.Optional(
-                CONF_INTERVAL_SECONDS,
-                default=int(current.get(CONF_INTERVAL_SECONDS, DEFAULT_INTERVAL_SECONDS)),
-            ): NumberSelector(
-                NumberSelectorConfig(min=10, max=86400, mode="box")
-            ),
+            **_tuning_schema(tuning),
             vol.Optional(
                 CONF_DELETE_ON_SUCCESS,
                 default=bool(current.get(CONF_DELETE_ON_SUCCESS, True)),
@@ -160,42 +277,113 @@ class QDoxieOptionsFlow(config_entries.OptionsFlow):
                 CONF_WAIT_FOR_TASK,
                 default=bool(current.get(CONF_WAIT_FOR_TASK, False)),
             ): BooleanSelector(),
+            vol.Optional(
+                CONF_DESTINATIONS,
+                default=get_destinations(current),
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    options=[MODE_PAPERLESS, MODE_CONSUME_DIR],
+                    multiple=True,
+                    mode="list",
+                )
+            ),
+            vol.Optional(
+                CONF_SUCCESS_POLICY,
+                default=str(current.get(CONF_SUCCESS_POLICY, POLICY_ALL)),
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    options=[POLICY_ALL, POLICY_ANY],
+                    mode="dropdown",
+                )
+            ),
         }
 
-        if mode == MODE_CONSUME_DIR:
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+        )
+
+    async def async_step_destinations(self, user_input=None):
+        """Step 2: settings of the selected destinations."""
+        errors: dict[str, str] = {}
+        current = {**self.config_entry.data, **self.config_entry.options}
+        destinations = self._options.get(CONF_DESTINATIONS) or get_destinations(current)
+
+        if user_input is not None:
+            # Without its target a destination always fails, and under the
+            # "all" policy scans would never be deleted.
+            if MODE_CONSUME_DIR in destinations and not str(user_input.get(CONF_CONSUME_DIR) or "").strip():
+                errors[CONF_CONSUME_DIR] = "required"
+            if MODE_PAPERLESS in destinations and not str(user_input.get(CONF_PAPERLESS_URL) or "").strip():
+                errors[CONF_PAPERLESS_URL] = "required"
+            try:
+                parse_profiles(user_input.get(CONF_UPLOAD_RATE_PROFILES))
+            except ValueError:
+                errors[CONF_UPLOAD_RATE_PROFILES] = "invalid_rate_profiles"
+            if not errors:
+                return self.async_create_entry(title="", data={**self._options, **user_input})
+            current = {**current, **user_input}
+
+        def _required(key: str) -> vol.Required:
+            value = str(current.get(key) or "")
+            return vol.Required(key, default=value) if value else vol.Required(key)
+
+        schema = {}
+
+        if MODE_CONSUME_DIR in destinations:
+            schema[_required(CONF_CONSUME_DIR)] = TextSelector()
+        if MODE_PAPERLESS in destinations:
+            schema[_required(CONF_PAPERLESS_URL)] = TextSelector()
             schema[
                 vol.Optional(
-                    CONF_CONSUME_DIR,
-                    default=str(current.get(CONF_CONSUME_DIR, "")),
+                    CONF_PAPERLESS_TOKEN,
+                    default=str(current.get(CONF_PAPERLESS_TOKEN, "")),
                 )
             ] = TextSelector()
-        else:
             schema[
                 vol.Optional(
-                    CONF_PAPERLESS_URL,
-                    default=str(current.get(CONF_PAPERLESS_URL, "")),
+                    CONF_PAPERLESS_USERNAME,
+                    default=str(current.get(CONF_PAPERLESS_USERNAME, "")),
                 )
             ] = TextSelector()
             schema[
                 vol.Optional(
-                    CONF_PAPERLESS_TOKEN,
-                    default=str(current.get(CONF_PAPERLESS_TOKEN, "")),
+                    CONF_PAPERLESS_PASSWORD,
+                    default=str(current.get(CONF_PAPERLESS_PASSWORD, "")),
                 )
             ] = TextSelector()
+            for key in (
+                CONF_PAPERLESS_TAGS,
+                CONF_PAPERLESS_CORRESPONDENT,
+                CONF_PAPERLESS_DOCUMENT_TYPE,
+                CONF_PAPERLESS_STORAGE_PATH,
+            ):
+                schema[vol.Optional(key, default=str(current.get(key, "")))] = TextSelector()
             schema[
                 vol.Optional(
-                    CONF_PAPERLESS_USERNAME,
-                    default=str(current.get(CONF_PAPERLESS_USERNAME, "")),
+                    CONF_METADATA_CACHE_TTL,
+                    default=int(current.get(CONF_METADATA_CACHE_TTL, DEFAULT_METADATA_CACHE_TTL)),
                 )
-            ] = TextSelector()
+            ] = NumberSelector(
+                NumberSelectorConfig(min=60, max=604800, mode="box")
+            )
             schema[
                 vol.Optional(
-                    CONF_PAPERLESS_PASSWORD,
-                    default=str(current.get(CONF_PAPERLESS_PASSWORD, "")),
+                    CONF_UPLOAD_RATE_LIMIT,
+                    default=int(current.get(CONF_UPLOAD_RATE_LIMIT, DEFAULT_UPLOAD_RATE_LIMIT)),
+                )
+            ] = NumberSelector(
+                NumberSelectorConfig(min=0, max=1048576, mode="box", unit_of_measurement="KiB/s")
+            )
+            schema[
+                vol.Optional(
+                    CONF_UPLOAD_RATE_PROFILES,
+                    default=str(current.get(CONF_UPLOAD_RATE_PROFILES, "")),
                 )
             ] = TextSelector()
 
         return self.async_show_form(
-            step_id="init",
+            step_id="destinations",
             data_schema=vol.Schema(schema),
+            errors=errors,
         )
@@ -7,10 +7,26 @@ from homeassistant.const import Platform
 DOMAIN = "qdoxie_scanner_api"
 
 # Home Assistant platforms provided by this integration.
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.IMAGE, Platform.SENSOR]
 
 # Home Assistant services
 SERVICE_SYNC_NOW = "sync_now"
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_TRACE = "record_trace"
+
+# Service fields
+ATTR_CYCLES = "cycles"
+ATTR_SCAN_PATHS = "scan_paths"
+ATTR_MAX_ITEMS = "max_items"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_DRY_RUN = "dry_run"
+ATTR_DRAIN = "drain"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PATH = "path"
+
+DEFAULT_PROFILE_CYCLES = 1
+MAX_PROFILE_CYCLES = 50
+MAX_SYNC_CONCURRENCY = 8
 
 # Doxie
 CONF_DOXIE_HOST = "doxie_host"
@@ -24,11 +40,33 @@ CONF_MODE = "mode"
 MODE_PAPERLESS = "paperless"
 MODE_CONSUME_DIR = "consume_dir"
 
+# Destinations: one download fanned out to several of the modes above.
+# Defaults to [CONF_MODE] for entries created before destinations existed.
+CONF_DESTINATIONS = "destinations"
+CONF_SUCCESS_POLICY = "success_policy"
+POLICY_ALL = "all"
+POLICY_ANY = "any"
+
 # Paperless
 CONF_PAPERLESS_URL = "paperless_url"
 CONF_PAPERLESS_TOKEN = "paperless_token"
 CONF_PAPERLESS_USERNAME = "paperless_username"
 CONF_PAPERLESS_PASSWORD = "paperless_password"
+# Metadata assigned on upload, configured by name.
+CONF_PAPERLESS_TAGS = "paperless_tags"
+CONF_PAPERLESS_CORRESPONDENT = "paperless_correspondent"
+CONF_PAPERLESS_DOCUMENT_TYPE = "paperless_document_type"
+CONF_PAPERLESS_STORAGE_PATH = "paperless_storage_path"
+CONF_METADATA_CACHE_TTL = "metadata_cache_ttl"
+
+DEFAULT_METADATA_CACHE_TTL = 3600
+
+# Upload bandwidth (KiB/s, 0 = unlimited) and optional time-of-day profiles,
+# e.g. "08:00-18:00=256, 22:00-06:00=0".
+CONF_UPLOAD_RATE_LIMIT = "upload_rate_limit"
+CONF_UPLOAD_RATE_PROFILES = "upload_rate_profiles"
+
+DEFAULT_UPLOAD_RATE_LIMIT = 0
 
 # Consume
 CONF_CONSUME_DIR = "consume_dir"
@@ -37,5 +75,15 @@ CONF_CONSUME_DIR = "consume_dir"
 CONF_INTERVAL_SECONDS = "interval_seconds"
 CONF_DELETE_ON_SUCCESS = "delete_on_success"
 CONF_WAIT_FOR_TASK = "wait_for_task"
+# Upper bound for the adaptive Doxie download concurrency.
+CONF_MAX_CONCURRENCY = "max_concurrency"
+# Connect/read timeout for Doxie and Paperless requests.
+CONF_TIMEOUT_SECONDS = "timeout_seconds"
 
 DEFAULT_INTERVAL_SECONDS = 300
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SECONDS = 300
+
+# Fields of the Doxie's hello.json that identify the device and its network;
+# redacted in diagnostics and recorded traces.
+DOXIE_IDENTITY_KEYS = frozenset({"MAC", "ip", "name", "network"})
@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 from datetime import timedelta
 import logging
 import os
 from pathlib import Path
+import time
 from typing import Any
 
+from aiohttp import ClientResponseError
+
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_CONSUME_DIR,
@@ -21,22 +27,56 @@ from .const import (
     CONF_DOXIE_PASSWORD,
     CONF_DOXIE_PORT,
     CONF_INTERVAL_SECONDS,
-    CONF_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_METADATA_CACHE_TTL,
+    CONF_PAPERLESS_CORRESPONDENT,
+    CONF_PAPERLESS_DOCUMENT_TYPE,
     CONF_PAPERLESS_PASSWORD,
+    CONF_PAPERLESS_STORAGE_PATH,
+    CONF_PAPERLESS_TAGS,
     CONF_PAPERLESS_TOKEN,
     CONF_PAPERLESS_URL,
     CONF_PAPERLESS_USERNAME,
+    CONF_SUCCESS_POLICY,
+    CONF_TIMEOUT_SECONDS,
+    CONF_UPLOAD_RATE_LIMIT,
+    CONF_UPLOAD_RATE_PROFILES,
     CONF_WAIT_FOR_TASK,
     DEFAULT_INTERVAL_SECONDS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_METADATA_CACHE_TTL,
+    DEFAULT_UPLOAD_RATE_LIMIT,
+    DOMAIN,
     MODE_CONSUME_DIR,
     MODE_PAPERLESS,
+    POLICY_ANY,
 )
+from .concurrency import AdaptiveConcurrency
 from .doxie_api import DoxieClient
-from .paperless_api import PaperlessClient
+from .helpers import get_destinations
+from .paperless_api import PaperlessClient, PaperlessMetadataCache
+from .preview import PreviewCache
+from .profiler import SyncProfiler
+from .ratelimit import UploadRateLimiter, parse_profiles
+from .timing import RequestTiming
+from .trace import TraceRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _split_names(value: Any) -> list[str]:
+    """Comma-separated tag names from the config."""
+    if not value:
+        return []
+    return [name.strip() for name in str(value).split(",") if name.strip()]
+
+
+def _single_name(value: Any) -> list[str]:
+    """One name from the config, kept whole (e.g. a correspondent "Doe, Jane")."""
+    name = str(value or "").strip()
+    return [name] if name else []
+
+
 class DoxiePaperlessCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(self, hass: HomeAssistant, entry_id: str, config: dict[str, Any]) -> None:
         self.hass = hass
@@ -58,20 +98,105 @@ class DoxiePaperlessCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             host=config[CONF_DOXIE_HOST],
             port=int(config.get(CONF_DOXIE_PORT, 80)),
             password=config.get(CONF_DOXIE_PASSWORD) or None,
+            timeout=config.get(CONF_TIMEOUT_SECONDS),
         )
 
         self.paperless: PaperlessClient | None = None
+        self.paperless_metadata: PaperlessMetadataCache | None = None
+        self.upload_limiter: UploadRateLimiter | None = None
         if config.get(CONF_PAPERLESS_URL):
+            try:
+                profiles = parse_profiles(config.get(CONF_UPLOAD_RATE_PROFILES))
+            except ValueError as err:
+                _LOGGER.error("Ignoring upload rate profiles: %s", err)
+                profiles = []
+            self.upload_limiter = UploadRateLimiter(
+                int(float(config.get(CONF_UPLOAD_RATE_LIMIT, DEFAULT_UPLOAD_RATE_LIMIT)) * 1024),
+                profiles,
+            )
             self.paperless = PaperlessClient(
                 session,
                 base_url=str(config[CONF_PAPERLESS_URL]),
                 token=config.get(CONF_PAPERLESS_TOKEN) or None,
                 username=config.get(CONF_PAPERLESS_USERNAME) or None,
                 password=config.get(CONF_PAPERLESS_PASSWORD) or None,
+                upload_limiter=self.upload_limiter,
+                timeout=config.get(CONF_TIMEOUT_SECONDS),
+            )
+            self.paperless_metadata = PaperlessMetadataCache(
+                self.paperless,
+                names={
+                    "tags": _split_names(config.get(CONF_PAPERLESS_TAGS)),
+                    "correspondent": _single_name(config.get(CONF_PAPERLESS_CORRESPONDENT)),
+                    "document_type": _single_name(config.get(CONF_PAPERLESS_DOCUMENT_TYPE)),
+                    "storage_path": _single_name(config.get(CONF_PAPERLESS_STORAGE_PATH)),
+                },
+                ttl=float(config.get(CONF_METADATA_CACHE_TTL, DEFAULT_METADATA_CACHE_TTL)),
             )
 
         self._last_recent_path: str | None = None
         self._sync_lock = asyncio.Lock()
+        self.previews = PreviewCache(hass, entry_id, self.async_update_listeners)
+        self.download_concurrency = AdaptiveConcurrency(
+            int(config.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY))
+        )
+
+        # On-demand profiling and trace recording (see the `profile` and
+        # `record_trace` services); the last finished profile stays around for
+        # the diagnostics download.
+        self.profiler: SyncProfiler | None = None
+        self.recorder: TraceRecorder | None = None
+        self.doxie.timer.add_listener(self._on_request_timing)
+        self.doxie.timer.add_listener(self.download_concurrency.observe)
+        if self.paperless:
+            self.paperless.timer.add_listener(self._on_request_timing)
+
+    def async_start_profile(self, cycles: int) -> None:
+        """Profile the next `cycles` sync cycles."""
+        self.profiler = SyncProfiler(cycles)
+        _LOGGER.info("Profiling the next %s sync cycle(s)", cycles)
+
+    def async_start_recording(self, cycles: int) -> Path:
+        """Record the requests of the next `cycles` sync cycles; returns the trace file path."""
+        stamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+        path = Path(self.hass.config.path(DOMAIN, "traces", f"{self.entry_id}_{stamp}.jsonl.gz"))
+        self.recorder = TraceRecorder(path, cycles)
+        _LOGGER.info("Recording requests of the next %s sync cycle(s) to %s", cycles, path)
+        return path
+
+    def _on_request_timing(self, timing: RequestTiming) -> None:
+        if self.profiler and self.profiler.active:
+            self.profiler.record_timing(timing)
+        if self.recorder and self.recorder.active:
+            self.recorder.record(timing)
+
+    @asynccontextmanager
+    async def _async_sync_cycle(self) -> AsyncIterator[None]:
+        """Serialize sync cycles and run them under the profiler/trace recorder if requested."""
+        async with self._sync_lock:
+            profiler = self.profiler if self.profiler and self.profiler.active else None
+            recorder = self.recorder if self.recorder and self.recorder.active else None
+            if profiler:
+                profiler.start_cycle()
+            try:
+                yield
+            finally:
+                if profiler:
+                    profiler.stop_cycle()
+                    if not profiler.active:
+                        _LOGGER.info("Profiling finished; download the diagnostics to inspect it")
+                if recorder:
+                    recorder.stop_cycle()
+                    if not recorder.active:
+                        self.hass.async_create_task(self._async_write_trace(recorder))
+
+    async def _async_write_trace(self, recorder: TraceRecorder) -> None:
+        try:
+            path = await self.hass.async_add_executor_job(recorder.write)
+        except OSError as err:
+            _LOGGER.error("Writing request trace failed: %s", err)
+            return
+        _LOGGER.info("Request trace written to %s (%s requests)", path, len(recorder.records))
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch status data for sensors."""
@@ -94,7 +219,7 @@ class DoxiePaperlessCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_sync_once(self) -> dict[str, Any]:
         """Check for a new scan and process it."""
-        async with self._sync_lock:
+        async with self._async_sync_cycle():
             result: dict[str, Any] = {
                 "changed": False,
                 "processed": False,
@@ -132,38 +257,169 @@ class DoxiePaperlessCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             except Exception:  # best-effort
                 pass
 
+            result.update(await self._async_process_scan(recent_path, modified))
+            if result["deleted"]:
+                self._last_recent_path = recent_path
+            # do not update last_recent_path if delete failed
+            return result
+
+    async def async_sync_batch(
+        self,
+        scan_paths: list[str] | None = None,
+        max_items: int | None = None,
+        concurrency: int | None = None,
+        dry_run: bool = False,
+        drain: bool = False,
+    ) -> dict[str, Any]:
+        """Process several scans at once and report per-item outcomes.
+
+        Scans are taken from `scan_paths`; with `drain` every scan currently
+        listed by the Doxie is processed (oldest first); otherwise only the
+        newest scan, like the periodic sync. `max_items` limits the list.
+        `concurrency` caps the scans in flight (default: the configured
+        maximum); downloads are additionally paced by the adaptive controller.
+        """
+        async with self._async_sync_cycle():
+            started = time.monotonic()
+            result: dict[str, Any] = {
+                "dry_run": dry_run,
+                "reason": None,
+                "items": [],
+                "processed": 0,
+                "failed": 0,
+                "duration": 0.0,
+            }
+
+            recent_path: str | None = None
+            if not scan_paths and not drain:
+                try:
+                    recent_path = await self.doxie.recent()
+                except Exception as err:  # noqa: BLE001
+                    result["reason"] = f"doxie_recent_failed: {err}"
+                    return result
+                if not recent_path:
+                    result["reason"] = "no_recent_scan"
+                    return result
+                if self._last_recent_path == recent_path:
+                    result["reason"] = "already_processed_recent"
+                    return result
+
             try:
-                content = await self.doxie.download_scan(recent_path)
+                scans = await self.doxie.scans()
             except Exception as err:  # noqa: BLE001
-                result["reason"] = f"download_failed: {err}"
+                if drain:
+                    result["reason"] = f"doxie_scans_failed: {err}"
+                    return result
+                scans = []
+            modified_by_path = {s.path: s.modified for s in scans}
+
+            if scan_paths:
+                paths = list(dict.fromkeys(scan_paths))
+            elif drain:
+                paths = [s.path for s in sorted(scans, key=lambda s: s.modified or "")]
+            else:
+                paths = [recent_path]
+            if max_items is not None:
+                paths = paths[:max_items]
+
+            if not paths:
+                result["reason"] = "no_scans"
                 return result
 
-            filename = os.path.basename(recent_path)
-            mode = self.config.get(CONF_MODE, MODE_PAPERLESS)
+            semaphore = asyncio.Semaphore(max(1, concurrency or self.download_concurrency.max_limit))
+
+            async def _run(path: str) -> dict[str, Any]:
+                async with semaphore:
+                    item_start = time.monotonic()
+                    if dry_run:
+                        item: dict[str, Any] = {
+                            "processed": False,
+                            "deleted": False,
+                            "reason": "dry_run",
+                            "size": None,
+                        }
+                    else:
+                        item = await self._async_process_scan(path, modified_by_path.get(path))
+                    return {
+                        "scan_path": path,
+                        "modified": modified_by_path.get(path),
+                        **item,
+                        "duration": round(time.monotonic() - item_start, 3),
+                    }
+
+            items = await asyncio.gather(*(_run(path) for path in paths))
+
+            result["items"] = items
+            result["processed"] = sum(1 for item in items if item["processed"])
+            result["failed"] = sum(1 for item in items if item["reason"] not in (None, "dry_run"))
+            result["duration"] = round(time.monotonic() - started, 3)
+
+            recent_path = recent_path or (self.data or {}).get("recent_path")
+            if recent_path and any(i["scan_path"] == recent_path and i["deleted"] for i in items):
+                self._last_recent_path = recent_path
+
+            return result
+
+    async def _async_process_scan(self, scan_path: str, modified: str | None) -> dict[str, Any]:
+        """Download one scan, hand it to every configured destination and delete it once the success policy is met."""
+        result: dict[str, Any] = {
+            "processed": False,
+            "deleted": False,
+            "reason": None,
+            "size": None,
+        }
+
+        try:
+            async with self.download_concurrency.slot():
+                content = await self.doxie.download_scan(scan_path)
+        except Exception as err:  # noqa: BLE001
+            result["reason"] = f"download_failed: {err}"
+            return result
+
+        result["size"] = len(content)
+        self.previews.async_submit(scan_path, content, modified)
+        filename = os.path.basename(scan_path)
+        destinations = get_destinations(self.config)
+
+        # Fan the single download out to every destination concurrently.
+        outcomes = await asyncio.gather(
+            *(self._async_deliver(dest, filename, content, modified) for dest in destinations),
+            return_exceptions=True,
+        )
+        failures: dict[str, str] = {}
+        for dest, outcome in zip(destinations, outcomes):
+            if isinstance(outcome, BaseException):
+                _LOGGER.error("Delivering %s to %s failed: %s", filename, dest, outcome)
+                failures[dest] = str(outcome)
+        result["destinations"] = {dest: failures.get(dest, "ok") for dest in destinations}
+
+        succeeded = len(destinations) - len(failures)
+        if self.config.get(CONF_SUCCESS_POLICY) == POLICY_ANY:
+            policy_met = succeeded > 0
+        else:
+            policy_met = not failures
+        if not policy_met:
+            result["reason"] = "process_failed: " + "; ".join(f"{d}: {e}" for d, e in failures.items())
+            return result
+        result["processed"] = True
 
+        # Delete on success
+        if self.config.get(CONF_DELETE_ON_SUCCESS, True):
             try:
-                if mode == MODE_CONSUME_DIR:
-                    await self._save_to_consume_dir(filename, content)
-                else:
-                    await self._upload_to_paperless(filename, content, modified)
-                result["processed"] = True
+                await self.doxie.delete_scan(scan_path)
+                result["deleted"] = True
             except Exception as err:  # noqa: BLE001
-                _LOGGER.exception("Processing failed")
-                result["reason"] = f"process_failed: {err}"
-                return result
+                result["reason"] = f"delete_failed: {err}"
 
-            # Delete on success
-            if self.config.get(CONF_DELETE_ON_SUCCESS, True):
-                try:
-                    await self.doxie.delete_scan(recent_path)
-                    result["deleted"] = True
-                    self._last_recent_path = recent_path
-                except Exception as err:  # noqa: BLE001
-                    result["reason"] = f"delete_failed: {err}"
-                    # do not update last_recent_path if delete failed
-                    return result
+        return result
 
-            return result
+    async def _async_deliver(self, destination: str, filename: str, content: bytes, modified: str | None) -> None:
+        if destination == MODE_CONSUME_DIR:
+            await self._save_to_consume_dir(filename, content)
+        elif destination == MODE_PAPERLESS:
+            await self._upload_to_paperless(filename, content, modified)
+        else:
+            raise ValueError(f"unknown destination: {destination}")
 
     async def _save_to_consume_dir(self, filename: str, content: bytes) -> None:
         consume_dir = self.config.get(CONF_CONSUME_DIR)
@@ -194,12 +450,42 @@ class DoxiePaperlessCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if not self.paperless:
             raise ValueError("paperless_url not configured")
 
-        task_id = await self.paperless.upload_document(
-            filename=filename,
-            content=content,
-            title=filename,
-            created=modified,
-        )
+        metadata_cache = self.paperless_metadata
+        metadata = None
+        if metadata_cache and metadata_cache.configured:
+            try:
+                metadata = await metadata_cache.async_get()
+            except Exception as err:  # noqa: BLE001
+                # Labels are optional: upload unclassified rather than not at all.
+                _LOGGER.warning("Resolving Paperless metadata failed, uploading without it: %s", err)
+
+        try:
+            task_id = await self.paperless.upload_document(
+                filename=filename,
+                content=content,
+                title=filename,
+                created=modified,
+                metadata=metadata,
+            )
+        except ClientResponseError as err:
+            if metadata is None or err.status not in (400, 404):
+                raise
+            # A cached ID may have been deleted/renamed in Paperless: re-resolve
+            # and retry once, but only if that actually changed an ID.
+            try:
+                changed = await metadata_cache.async_refresh()
+            except Exception:  # noqa: BLE001
+                changed = False
+            if not changed:
+                raise
+            _LOGGER.debug("Upload rejected (%s); retrying with refreshed Paperless metadata", err.status)
+            task_id = await self.paperless.upload_document(
+                filename=filename,
+                content=content,
+                title=filename,
+                created=modified,
+                metadata=await metadata_cache.async_get(),
+            )
 
         if not self.config.get(CONF_WAIT_FOR_TASK, False):
             return
@@ -0,0 +1,49 @@
+"""Diagnostics support for QDoxie Scanner API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_DOXIE_HOST,
+    CONF_DOXIE_PASSWORD,
+    CONF_PAPERLESS_PASSWORD,
+    CONF_PAPERLESS_TOKEN,
+    CONF_PAPERLESS_URL,
+    CONF_PAPERLESS_USERNAME,
+    DOMAIN,
+    DOXIE_IDENTITY_KEYS,
+)
+from .coordinator import DoxiePaperlessCoordinator
+
+TO_REDACT = {
+    CONF_DOXIE_HOST,
+    CONF_DOXIE_PASSWORD,
+    CONF_PAPERLESS_PASSWORD,
+    CONF_PAPERLESS_TOKEN,
+    CONF_PAPERLESS_URL,  # may carry basic-auth credentials
+    CONF_PAPERLESS_USERNAME,
+    *DOXIE_IDENTITY_KEYS,
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator: DoxiePaperlessCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return async_redact_data(
+        {
+            "config": {**entry.data, **entry.options},
+            "data": coordinator.data,
+            "download_concurrency": {
+                "limit": coordinator.download_concurrency.limit,
+                "max_limit": coordinator.download_concurrency.max_limit,
+                "latency": coordinator.download_concurrency.latency,
+            },
+            "profile": coordinator.profiler.as_dict() if coordinator.profiler else None,
+        },
+        TO_REDACT,
+    )
@@ -14,7 +14,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from aiohttp import BasicAuth, ClientResponseError, ClientSession
+from aiohttp import BasicAuth, ClientResponseError, ClientSession, ClientTimeout
+
+from .timing import RequestTimer
 
 
 @dataclass
@@ -38,11 +40,23 @@ class DoxieScan:
 
 
 class DoxieClient:
-    def __init__(self, session: ClientSession, host: str, port: int = 80, password: str | None = None) -> None:
+    def __init__(
+        self,
+        session: ClientSession,
+        host: str,
+        port: int = 80,
+        password: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
         self._session = session
+        # Per-socket timeouts, so large downloads are not cut off by a total limit.
+        self._request_kwargs: dict[str, Any] = (
+            {"timeout": ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)} if timeout else {}
+        )
         self._host = host
         self._port = port
         self._auth = BasicAuth("doxie", password) if password else None
+        self.timer = RequestTimer("doxie")
 
     @property
     def base_url(self) -> str:
@@ -50,12 +64,18 @@ class DoxieClient:
 
     async def _json(self, method: str, path: str) -> Any:
         url = f"{self.base_url}{path}"
-        async with self._session.request(method, url, auth=self._auth) as resp:
-            # Doxie uses 204 for "no content".
-            if resp.status == 204:
-                return None
-            resp.raise_for_status()
-            return await resp.json(content_type=None)
+        with self.timer.track(method, path) as rec:
+            async with self._session.request(method, url, auth=self._auth, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                # Doxie uses 204 for "no content".
+                if resp.status == 204:
+                    rec.size = 0
+                    return None
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+                rec.size = resp.content_length
+                rec.body = data
+                return data
 
     async def hello(self) -> DoxieHello:
         data = await self._json("GET", "/hello.json")
@@ -84,10 +104,15 @@ class DoxieClient:
 
     async def download_scan(self, scan_path: str) -> bytes:
         """Downloads a scan using GET /scans{path}."""
-        url = f"{self.base_url}/scans{scan_path}"
-        async with self._session.get(url, auth=self._auth) as resp:
-            resp.raise_for_status()
-            return await resp.read()
+        path = f"/scans{scan_path}"
+        url = f"{self.base_url}{path}"
+        with self.timer.track("GET", path) as rec:
+            async with self._session.get(url, auth=self._auth, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                resp.raise_for_status()
+                content = await resp.read()
+                rec.size = len(content)
+                return content
 
     async def delete_scan(self, scan_path: str) -> None:
         """Deletes a scan using DELETE /scans{path}."""
@@ -97,9 +122,12 @@ class DoxieClient:
         """Deletes multiple scans using POST /scans/delete.json."""
         if not scan_paths:
             return
-        url = f"{self.base_url}/scans/delete.json"
-        async with self._session.post(url, json=scan_paths, auth=self._auth) as resp:
-            # Doxie returns 204 on success, 403 on error.
-            if resp.status == 204:
-                return
-            resp.raise_for_status()
+        path = "/scans/delete.json"
+        url = f"{self.base_url}{path}"
+        with self.timer.track("POST", path) as rec:
+            async with self._session.post(url, json=scan_paths, auth=self._auth, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                # Doxie returns 204 on success, 403 on error.
+                if resp.status == 204:
+                    return
+                resp.raise_for_status()
@@ -0,0 +1,15 @@
+"""Small helpers shared by the config flow and the coordinator."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import CONF_DESTINATIONS, CONF_MODE, MODE_PAPERLESS
+
+
+def get_destinations(config: dict[str, Any]) -> list[str]:
+    """Configured destinations; falls back to the single mode chosen at setup."""
+    destinations = config.get(CONF_DESTINATIONS)
+    if destinations:
+        return [str(d) for d in destinations]
+    return [str(config.get(CONF_MODE, MODE_PAPERLESS))]
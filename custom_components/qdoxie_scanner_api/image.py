@@ -0,0 +1,56 @@
+"""Image entity showing a preview of the most recent scan."""
+
+from __future__ import annotations
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import DoxiePaperlessCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: DoxiePaperlessCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([DoxieLastScanImage(hass, coordinator, entry)])
+
+
+class DoxieLastScanImage(CoordinatorEntity[DoxiePaperlessCoordinator], ImageEntity):
+    """Thumbnail of the last scan, served from the coordinator's preview cache."""
+
+    _attr_icon = "mdi:file-image"
+    _attr_name = "Doxie Last Scan Preview"
+    _attr_content_type = "image/jpeg"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DoxiePaperlessCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        CoordinatorEntity.__init__(self, coordinator)
+        ImageEntity.__init__(self, hass)
+        self._attr_unique_id = f"{entry.entry_id}_last_scan_preview"
+        self._attr_image_last_updated = coordinator.previews.latest_at
+
+    def _scan_path(self) -> str | None:
+        # After a restart only the disk cache is left; look it up by the
+        # Doxie's current recent scan.
+        return self.coordinator.previews.latest_path or (self.coordinator.data or {}).get("recent_path")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_image_last_updated = self.coordinator.previews.latest_at
+        super()._handle_coordinator_update()
+
+    async def async_image(self) -> bytes | None:
+        scan_path = self._scan_path()
+        if not scan_path:
+            return None
+        return await self.coordinator.previews.async_get(scan_path)
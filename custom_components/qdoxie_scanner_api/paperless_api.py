@@ -3,15 +3,34 @@
 Uses ONLY endpoints documented in the official REST API docs:
 - POST /api/documents/post_document/
 - GET /api/tasks/?task_id={uuid}
+- GET /api/ (API root, used as a latency probe)
+- GET /api/{tags,correspondents,document_types,storage_paths}/?name__iexact={name}
 - (Auth headers per docs)
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import time
 from typing import Any, Optional
+from urllib.parse import quote
 
-from aiohttp import BasicAuth, ClientSession, FormData
+from aiohttp import BasicAuth, ClientSession, ClientTimeout, FormData
+
+from .ratelimit import ThrottledBytesPayload, UploadRateLimiter
+from .timing import RequestTimer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Metadata kinds -> list endpoint.
+METADATA_ENDPOINTS = {
+    "tags": "/api/tags/",
+    "correspondent": "/api/correspondents/",
+    "document_type": "/api/document_types/",
+    "storage_path": "/api/storage_paths/",
+}
 
 
 @dataclass
@@ -21,6 +40,16 @@ class PaperlessTask:
     document_id: int | None = None
 
 
+@dataclass
+class PaperlessMetadata:
+    """Resolved object IDs sent along with an upload."""
+
+    tags: list[int] = field(default_factory=list)
+    correspondent: int | None = None
+    document_type: int | None = None
+    storage_path: int | None = None
+
+
 class PaperlessClient:
     def __init__(
         self,
@@ -29,11 +58,19 @@ class PaperlessClient:
         token: str | None = None,
         username: str | None = None,
         password: str | None = None,
+        upload_limiter: UploadRateLimiter | None = None,
+        timeout: float | None = None,
     ) -> None:
         self._session = session
+        # Per-socket timeouts, so throttled uploads are not cut off by a total limit.
+        self._request_kwargs: dict[str, Any] = (
+            {"timeout": ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)} if timeout else {}
+        )
+        self._upload_limiter = upload_limiter
         self._base_url = base_url.rstrip("/")
         self._token = token
         self._basic = BasicAuth(username, password) if (username and password) else None
+        self.timer = RequestTimer("paperless")
 
     def _headers(self) -> dict[str, str]:
         if self._token:
@@ -46,50 +83,81 @@ class PaperlessClient:
         content: bytes,
         title: str | None = None,
         created: str | None = None,
+        metadata: PaperlessMetadata | None = None,
     ) -> str:
         """Uploads a document and returns the consumption task UUID (string).
 
         The API docs state it returns HTTP 200 with the UUID in the response body.
         Some deployments may return JSON; we accept both.
         """
-        url = f"{self._base_url}/api/documents/post_document/"
+        path = "/api/documents/post_document/"
+        url = f"{self._base_url}{path}"
         form = FormData()
-        form.add_field("document", content, filename=filename)
+        limiter = self._upload_limiter
+        if limiter and limiter.rate > 0:
+            # Sized payload paced by the bucket; keeps the Content-Length.
+            form.add_field(
+                "document",
+                ThrottledBytesPayload(content, limiter, content_type="application/octet-stream"),
+                filename=filename,
+            )
+        else:
+            form.add_field("document", content, filename=filename)
         if title:
             form.add_field("title", title)
         if created:
             form.add_field("created", created)
+        if metadata:
+            for tag_id in metadata.tags:
+                form.add_field("tags", str(tag_id))
+            for key in ("correspondent", "document_type", "storage_path"):
+                value = getattr(metadata, key)
+                if value is not None:
+                    form.add_field(key, str(value))
 
-        async with self._session.post(
-            url,
-            data=form,
-            headers=self._headers(),
-            auth=self._basic,
-        ) as resp:
-            resp.raise_for_status()
-            # Try JSON first; else treat as plain text.
-            ctype = (resp.headers.get("Content-Type") or "").lower()
-            if "application/json" in ctype:
-                data = await resp.json(content_type=None)
-                # commonly: {"task_id": "uuid"} or "uuid"; keep flexible.
-                if isinstance(data, str):
-                    return data
-                if isinstance(data, dict):
-                    for k in ("task_id", "id", "uuid"):
-                        if k in data and isinstance(data[k], str):
-                            return data[k]
-                raise ValueError(f"Unexpected JSON response from Paperless upload: {data!r}")
-            text = (await resp.text()).strip().strip('"')
-            if not text:
-                raise ValueError("Empty response from Paperless upload")
-            return text
+        with self.timer.track("POST", path) as rec:
+            rec.size = len(content)
+            async with self._session.post(
+                url,
+                data=form,
+                headers=self._headers(),
+                auth=self._basic,
+                **self._request_kwargs,
+            ) as resp:
+                rec.status = resp.status
+                if limiter and limiter.rate <= 0:
+                    limiter.record(len(content))
+                resp.raise_for_status()
+                # Try JSON first; else treat as plain text.
+                ctype = (resp.headers.get("Content-Type") or "").lower()
+                if "application/json" in ctype:
+                    data = await resp.json(content_type=None)
+                    rec.body = data
+                    # commonly: {"task_id": "uuid"} or "uuid"; keep flexible.
+                    if isinstance(data, str):
+                        return data
+                    if isinstance(data, dict):
+                        for k in ("task_id", "id", "uuid"):
+                            if k in data and isinstance(data[k], str):
+                                return data[k]
+                    raise ValueError(f"Unexpected JSON response from Paperless upload: {data!r}")
+                text = (await resp.text()).strip().strip('"')
+                rec.body = text
+                if not text:
+                    raise ValueError("Empty response from Paperless upload")
+                return text
 
     async def get_task(self, task_id: str) -> PaperlessTask:
         """Fetch task state. Returns raw response; tries to extract status/document id."""
-        url = f"{self._base_url}/api/tasks/?task_id={task_id}"
-        async with self._session.get(url, headers=self._headers(), auth=self._basic) as resp:
-            resp.raise_for_status()
-            data = await resp.json(content_type=None)
+        path = f"/api/tasks/?task_id={task_id}"
+        url = f"{self._base_url}{path}"
+        with self.timer.track("GET", path) as rec:
+            async with self._session.get(url, headers=self._headers(), auth=self._basic, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+                rec.size = resp.content_length
+                rec.body = data
 
         # The schema isn't described in detail in the snippet; keep parsing best-effort.
         status: str | None = None
@@ -106,3 +174,94 @@ class PaperlessClient:
                     if isinstance(doc_id, str) and doc_id.isdigit():
                         doc_id = int(doc_id)
         return PaperlessTask(raw=data, status=status if isinstance(status, str) else None, document_id=doc_id if isinstance(doc_id, int) else None)
+
+    async def ping(self) -> None:
+        """GET the API root; raises on connection/auth errors."""
+        path = "/api/"
+        url = f"{self._base_url}{path}"
+        with self.timer.track("GET", path) as rec:
+            async with self._session.get(url, headers=self._headers(), auth=self._basic, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                resp.raise_for_status()
+                await resp.read()
+                rec.size = resp.content_length
+
+    async def find_id(self, kind: str, name: str) -> int | None:
+        """Look up the ID of a tag/correspondent/document type/storage path by name."""
+        path = f"{METADATA_ENDPOINTS[kind]}?name__iexact={quote(name)}"
+        url = f"{self._base_url}{path}"
+        with self.timer.track("GET", path) as rec:
+            async with self._session.get(url, headers=self._headers(), auth=self._basic, **self._request_kwargs) as resp:
+                rec.status = resp.status
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+                rec.size = resp.content_length
+                rec.body = data
+
+        results = data.get("results") if isinstance(data, dict) else None
+        if isinstance(results, list):
+            for item in results:
+                if isinstance(item, dict) and isinstance(item.get("id"), int):
+                    return item["id"]
+        return None
+
+
+class PaperlessMetadataCache:
+    """Resolves configured metadata names to IDs, cached with a TTL.
+
+    Names are looked up once and reused for every upload until the TTL expires
+    or `async_refresh()` is called (e.g. after Paperless rejected a stale ID).
+    Unknown names are cached as well so they don't cost a request per upload.
+    """
+
+    def __init__(self, client: PaperlessClient, names: dict[str, list[str]], ttl: float) -> None:
+        self._client = client
+        self._names = {kind: values for kind, values in names.items() if values}
+        self._ttl = ttl
+        self._ids: dict[tuple[str, str], int | None] = {}
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._names)
+
+    async def async_refresh(self) -> bool:
+        """Look all names up again; returns True if any resolved ID changed."""
+        async with self._lock:
+            previous = dict(self._ids)
+            await self._async_refresh()
+        return self._ids != previous
+
+    async def async_get(self) -> PaperlessMetadata:
+        async with self._lock:
+            if self._fetched_at is None or time.monotonic() - self._fetched_at > self._ttl:
+                await self._async_refresh()
+        return self._build()
+
+    async def _async_refresh(self) -> None:
+        ids: dict[tuple[str, str], int | None] = {}
+        for kind, values in self._names.items():
+            for name in values:
+                ids[(kind, name)] = await self._client.find_id(kind, name)
+                if ids[(kind, name)] is None:
+                    _LOGGER.warning("Paperless %s %r not found; it will not be assigned", kind, name)
+        self._ids = ids
+        self._fetched_at = time.monotonic()
+
+    def _build(self) -> PaperlessMetadata:
+        def _first(kind: str) -> int | None:
+            for name in self._names.get(kind, []):
+                return self._ids.get((kind, name))
+            return None
+
+        return PaperlessMetadata(
+            tags=[
+                tag_id
+                for name in self._names.get("tags", [])
+                if (tag_id := self._ids.get(("tags", name))) is not None
+            ],
+            correspondent=_first("correspondent"),
+            document_type=_first("document_type"),
+            storage_path=_first("storage_path"),
+        )
@@ -0,0 +1,156 @@
+"""Thumbnail cache for the last-scan image entity.
+
+Thumbnails are generated once, in the executor, from the bytes the sync
+pipeline already downloaded, and kept in a small in-memory LRU backed by a
+bounded directory on disk, so serving a preview never touches the Doxie.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime
+import hashlib
+import io
+import itertools
+import logging
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (512, 512)
+THUMBNAIL_QUALITY = 80
+MAX_MEMORY_ITEMS = 8
+MAX_DISK_ITEMS = 32
+
+JPEG_SOI = b"\xff\xd8\xff"
+
+
+def make_thumbnail(content: bytes) -> bytes | None:
+    """Render a JPEG thumbnail of a scan (blocking).
+
+    JPEG/PNG scans are decoded directly. Doxie PDFs are image-only, so for
+    them the first embedded JPEG stream is used as the page image. Pillow is
+    imported here so a broken install only disables previews.
+    """
+    try:
+        from PIL import Image  # noqa: PLC0415
+    except ImportError as err:
+        _LOGGER.debug("Pillow is not available, no thumbnail: %s", err)
+        return None
+
+    data = content
+    if content.startswith(b"%PDF"):
+        offset = content.find(JPEG_SOI)
+        if offset < 0:
+            return None
+        data = content[offset:]
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", THUMBNAIL_SIZE)
+            img.thumbnail(THUMBNAIL_SIZE)
+            out = io.BytesIO()
+            img.convert("RGB").save(out, format="JPEG", quality=THUMBNAIL_QUALITY)
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Could not create thumbnail: %s", err)
+        return None
+    return out.getvalue()
+
+
+class PreviewCache:
+    """Thumbnails keyed by scan path: memory LRU in front of a bounded disk cache."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, on_update: Callable[[], None]) -> None:
+        self._hass = hass
+        self._dir = Path(hass.config.path(DOMAIN, "previews", entry_id))
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._on_update = on_update
+        self.latest_path: str | None = None
+        self.latest_at: datetime | None = None
+
+        # Scans are ordered by (modified, submission order); only a scan newer
+        # than everything submitted so far gets a thumbnail.
+        self._sequence = itertools.count()
+        self._newest_submitted: tuple[str, int] | None = None
+        self._latest_key: tuple[str, int] | None = None
+        # At most one job runs; newer submissions replace the waiting one, so
+        # draining a backlog never queues more than one extra scan buffer.
+        self._pending: tuple[str, bytes, tuple[str, int]] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def _file(self, scan_path: str) -> Path:
+        return self._dir / f"{hashlib.sha1(scan_path.encode()).hexdigest()}.jpg"
+
+    def _remember(self, scan_path: str, thumbnail: bytes) -> None:
+        self._memory[scan_path] = thumbnail
+        self._memory.move_to_end(scan_path)
+        while len(self._memory) > MAX_MEMORY_ITEMS:
+            self._memory.popitem(last=False)
+
+    def _store(self, scan_path: str, content: bytes) -> bytes | None:
+        """Create the thumbnail and write it to disk (blocking)."""
+        thumbnail = make_thumbnail(content)
+        if thumbnail is None:
+            return None
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._file(scan_path).write_bytes(thumbnail)
+        files = sorted(self._dir.glob("*.jpg"), key=lambda f: f.stat().st_mtime)
+        for old in files[:-MAX_DISK_ITEMS]:
+            old.unlink(missing_ok=True)
+        return thumbnail
+
+    def _load(self, scan_path: str) -> bytes | None:
+        try:
+            return self._file(scan_path).read_bytes()
+        except OSError:
+            return None
+
+    def async_submit(self, scan_path: str, content: bytes, modified: str | None) -> None:
+        """Queue a thumbnail for a freshly downloaded scan if it is the newest one."""
+        key = (modified or "", next(self._sequence))
+        if self._newest_submitted is not None and key <= self._newest_submitted:
+            return
+        self._newest_submitted = key
+        self._pending = (scan_path, content, key)
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_task(self._async_process_pending())
+
+    async def _async_process_pending(self) -> None:
+        while self._pending is not None:
+            scan_path, content, key = self._pending
+            self._pending = None
+            if await self._async_add(scan_path, content, key):
+                self._on_update()
+
+    async def _async_add(self, scan_path: str, content: bytes, key: tuple[str, int]) -> bool:
+        """Generate and cache the thumbnail of a scan."""
+        try:
+            thumbnail = await self._hass.async_add_executor_job(self._store, scan_path, content)
+        except OSError as err:
+            _LOGGER.warning("Storing preview for %s failed: %s", scan_path, err)
+            return False
+        if thumbnail is None:
+            return False
+        self._remember(scan_path, thumbnail)
+        if self._latest_key is not None and key <= self._latest_key:
+            return False
+        self._latest_key = key
+        self.latest_path = scan_path
+        self.latest_at = dt_util.utcnow()
+        return True
+
+    async def async_get(self, scan_path: str) -> bytes | None:
+        thumbnail = self._memory.get(scan_path)
+        if thumbnail is not None:
+            self._memory.move_to_end(scan_path)
+            return thumbnail
+        thumbnail = await self._hass.async_add_executor_job(self._load, scan_path)
+        if thumbnail is not None:
+            self._remember(scan_path, thumbnail)
+        return thumbnail
@@ -0,0 +1,105 @@
+"""Short link benchmark used by the config/options flow to pre-fill tuning values."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import statistics
+import time
+
+from .const import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_TIMEOUT_SECONDS,
+    MAX_SYNC_CONCURRENCY,
+)
+from .doxie_api import DoxieClient
+from .paperless_api import PaperlessClient
+
+_LOGGER = logging.getLogger(__name__)
+
+HELLO_SAMPLES = 3
+# Time budgets (seconds) per probe phase; worst case ~18 s in total.
+HELLO_TIMEOUT = 5
+DOWNLOAD_TIMEOUT = 8
+PAPERLESS_TIMEOUT = 5
+# Larger scans are not used as download sample.
+MAX_SAMPLE_SIZE = 2 * 1024 * 1024
+# Size assumed for a typical multi-page scan when deriving the timeout.
+TYPICAL_SCAN_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class LinkProbe:
+    doxie_rtt: float
+    download_throughput: float | None = None  # bytes/s
+    download_size: int | None = None
+    paperless_latency: float | None = None
+
+    def recommend(self) -> dict[str, int]:
+        """Recommended interval, max concurrency and timeout (seconds)."""
+        # Slow links get polled less often; scale 60 s .. 600 s with the RTT.
+        interval = min(600, max(60, int(60 + 600 * self.doxie_rtt)))
+        interval = round(interval / 10) * 10
+
+        throughput = self.download_throughput
+        if throughput is None:
+            concurrency = DEFAULT_MAX_CONCURRENCY
+        elif throughput >= 1024 * 1024 and self.doxie_rtt < 0.1:
+            concurrency = MAX_SYNC_CONCURRENCY // 2
+        elif throughput >= 256 * 1024:
+            concurrency = 2
+        else:
+            concurrency = 1
+
+        if throughput:
+            timeout = int(3 * TYPICAL_SCAN_SIZE / throughput + 10 * self.doxie_rtt)
+        else:
+            timeout = DEFAULT_TIMEOUT_SECONDS
+        if self.paperless_latency is not None:
+            timeout = max(timeout, int(10 * self.paperless_latency))
+        timeout = min(600, max(30, timeout))
+
+        return {"interval": interval, "concurrency": concurrency, "timeout": timeout}
+
+
+async def async_probe_link(doxie: DoxieClient, paperless: PaperlessClient | None = None) -> LinkProbe:
+    """Measure hello.json RTT, a sample download and Paperless API latency.
+
+    Every phase is time-bounded so a sleeping device cannot stall the flow.
+    Doxie hello and Paperless errors (including TimeoutError) propagate. The
+    download sample is best-effort: it is skipped when there is no scan of
+    at most MAX_SAMPLE_SIZE or when it does not finish within its budget.
+    """
+    rtts: list[float] = []
+    async with asyncio.timeout(HELLO_TIMEOUT):
+        for _ in range(HELLO_SAMPLES):
+            start = time.monotonic()
+            await doxie.hello()
+            rtts.append(time.monotonic() - start)
+    probe = LinkProbe(doxie_rtt=statistics.median(rtts))
+
+    try:
+        async with asyncio.timeout(DOWNLOAD_TIMEOUT):
+            scans = await doxie.scans()
+            candidates = [s for s in scans if s.size and s.size <= MAX_SAMPLE_SIZE]
+            if candidates:
+                # The smallest scan keeps the probe short.
+                sample = min(candidates, key=lambda s: s.size or 0)
+                start = time.monotonic()
+                content = await doxie.download_scan(sample.path)
+                elapsed = time.monotonic() - start
+                probe.download_size = len(content)
+                if content and elapsed > 0:
+                    probe.download_throughput = len(content) / elapsed
+    except Exception as err:  # noqa: BLE001
+        _LOGGER.debug("Probe download sample skipped: %r", err)
+
+    if paperless:
+        async with asyncio.timeout(PAPERLESS_TIMEOUT):
+            start = time.monotonic()
+            await paperless.ping()
+            probe.paperless_latency = time.monotonic() - start
+
+    _LOGGER.debug("Link probe: %s -> %s", probe, probe.recommend())
+    return probe
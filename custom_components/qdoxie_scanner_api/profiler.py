@@ -0,0 +1,98 @@
+"""On-demand profiling of sync cycles.
+
+Python ships no sampling profiler, so this uses cProfile (the same approach as
+HA's own `profiler` integration). It only runs for the requested number of
+sync cycles and is disabled in between.
+"""
+
+from __future__ import annotations
+
+import cProfile
+from dataclasses import asdict
+from datetime import datetime, timezone
+import logging
+import pstats
+import time
+from typing import Any
+
+from .timing import RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keep diagnostics bundles small.
+MAX_TIMINGS = 1000
+TOP_FUNCTIONS = 40
+
+
+class SyncProfiler:
+    """Profiles the next N sync cycles and collects per-request timings."""
+
+    def __init__(self, cycles: int) -> None:
+        self.cycles = cycles
+        self.requested_at = datetime.now(timezone.utc).isoformat()
+        self.finished_at: str | None = None
+        self.cycle_durations: list[float] = []
+        self.timings: list[dict[str, Any]] = []
+        self.functions: list[dict[str, Any]] = []
+        self._profile = cProfile.Profile()
+        self._cycle_start: float | None = None
+        self._enabled = False
+
+    @property
+    def active(self) -> bool:
+        return self.finished_at is None
+
+    def start_cycle(self) -> None:
+        self._cycle_start = time.monotonic()
+        try:
+            self._profile.enable()
+            self._enabled = True
+        except ValueError:
+            # Another profiler (e.g. HA's profiler integration) is running.
+            _LOGGER.warning("Another profiler is active; recording request timings only")
+            self._enabled = False
+
+    def stop_cycle(self) -> None:
+        if self._enabled:
+            self._profile.disable()
+            self._enabled = False
+        if self._cycle_start is not None:
+            self.cycle_durations.append(round(time.monotonic() - self._cycle_start, 4))
+            self._cycle_start = None
+        if len(self.cycle_durations) >= self.cycles:
+            self._finish()
+
+    def record_timing(self, timing: RequestTiming) -> None:
+        if self.active and len(self.timings) < MAX_TIMINGS:
+            data = asdict(timing)
+            data.pop("body", None)
+            self.timings.append(data)
+
+    def _finish(self) -> None:
+        self.finished_at = datetime.now(timezone.utc).isoformat()
+        try:
+            stats = pstats.Stats(self._profile)
+        except TypeError:
+            # No data collected (profiler never enabled).
+            return
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        self.functions = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "primitive_calls": cc,
+                "calls": nc,
+                "total_time": round(tt, 6),
+                "cumulative_time": round(ct, 6),
+            }
+            for (filename, line, name), (cc, nc, tt, ct, _callers) in rows[:TOP_FUNCTIONS]
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cycles": self.cycles,
+            "requested_at": self.requested_at,
+            "finished_at": self.finished_at,
+            "cycle_durations": self.cycle_durations,
+            "functions": self.functions,
+            "request_timings": self.timings,
+        }
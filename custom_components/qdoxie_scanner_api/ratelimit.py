@@ -0,0 +1,143 @@
+"""Token-bucket bandwidth limiter for Paperless uploads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from datetime import time as dt_time
+import time
+from typing import Any
+
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import BytesPayload
+
+from homeassistant.util import dt as dt_util
+
+CHUNK_SIZE = 16 * 1024
+# Window for the throughput measurement exposed as a sensor.
+THROUGHPUT_WINDOW = 10.0
+
+
+@dataclass
+class RateProfile:
+    start: dt_time
+    end: dt_time
+    rate: int  # bytes/s, 0 = unlimited
+
+    def matches(self, now: dt_time) -> bool:
+        if self.start <= self.end:
+            return self.start <= now < self.end
+        # Range wraps past midnight (e.g. 22:00-06:00).
+        return now >= self.start or now < self.end
+
+
+def parse_profiles(value: str | None) -> list[RateProfile]:
+    """Parse "HH:MM-HH:MM=KiB/s" entries separated by commas.
+
+    Raises ValueError on malformed input.
+    """
+    profiles: list[RateProfile] = []
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        span, _, rate = entry.partition("=")
+        start, _, end = span.partition("-")
+        if not rate or not end:
+            raise ValueError(f"Invalid rate profile: {entry!r}")
+        profiles.append(
+            RateProfile(
+                start=dt_time.fromisoformat(start.strip()),
+                end=dt_time.fromisoformat(end.strip()),
+                rate=int(float(rate) * 1024),
+            )
+        )
+    return profiles
+
+
+class UploadRateLimiter:
+    """Shared token bucket for all uploads of one config entry.
+
+    The bucket holds about one second worth of tokens, so bursts stay short.
+    Waiters are served in order, which splits the configured rate across
+    concurrent uploads instead of letting one of them starve the others.
+    """
+
+    def __init__(self, rate: int, profiles: list[RateProfile] | None = None) -> None:
+        self._default_rate = rate
+        self._profiles = profiles or []
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._sent: deque[tuple[float, int]] = deque()
+
+    @property
+    def rate(self) -> int:
+        """Current limit in bytes/s (0 = unlimited)."""
+        now = dt_util.now().time()
+        for profile in self._profiles:
+            if profile.matches(now):
+                return profile.rate
+        return self._default_rate
+
+    @property
+    def throughput(self) -> float:
+        """Bytes/s sent during the last THROUGHPUT_WINDOW seconds."""
+        self._expire(time.monotonic())
+        return sum(n for _, n in self._sent) / THROUGHPUT_WINDOW
+
+    def record(self, size: int) -> None:
+        now = time.monotonic()
+        self._sent.append((now, size))
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        while self._sent and now - self._sent[0][0] > THROUGHPUT_WINDOW:
+            self._sent.popleft()
+
+    async def acquire(self, size: int) -> None:
+        async with self._lock:
+            while True:
+                rate = self.rate
+                now = time.monotonic()
+                if rate <= 0:
+                    self._last = now
+                    return
+                # Never cap below one chunk, or slow rates could wait forever.
+                capacity = float(max(rate, size))
+                self._tokens = min(capacity, self._tokens + (now - self._last) * rate)
+                self._last = now
+                if self._tokens >= size:
+                    self._tokens -= size
+                    return
+                await asyncio.sleep((size - self._tokens) / rate)
+
+
+class ThrottledBytesPayload(BytesPayload):
+    """Bytes payload written in chunks paced by an UploadRateLimiter.
+
+    Unlike a streamed (async iterable) body it keeps its size, so the request
+    still carries a Content-Length; Django's multipart parser (Paperless)
+    ignores chunked bodies.
+    """
+
+    def __init__(self, value: bytes, limiter: UploadRateLimiter, **kwargs: Any) -> None:
+        super().__init__(value, **kwargs)
+        self._limiter = limiter
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self._write_paced(writer, None)
+
+    async def write_with_length(self, writer: AbstractStreamWriter, content_length: int | None) -> None:
+        await self._write_paced(writer, content_length)
+
+    async def _write_paced(self, writer: AbstractStreamWriter, content_length: int | None) -> None:
+        view = memoryview(self._value)
+        if content_length is not None:
+            view = view[:content_length]
+        for offset in range(0, len(view), CHUNK_SIZE):
+            chunk = bytes(view[offset : offset + CHUNK_SIZE])
+            await self._limiter.acquire(len(chunk))
+            await writer.write(chunk)
+            self._limiter.record(len(chunk))
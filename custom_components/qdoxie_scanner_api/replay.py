@@ -0,0 +1,101 @@
+"""Replay server for recorded request traces.
+
+Serves a trace written by the `record_trace` service with the recorded status
+codes, response shapes, sizes and latencies, so sync-engine changes can be
+compared offline against real traffic. Doxie and Paperless paths do not
+overlap, so one server stands in for both: point the Doxie host/port and the
+Paperless URL of a test instance at it.
+
+    python -m custom_components.qdoxie_scanner_api.replay TRACE [--port 8099] [--speed 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict, deque
+import logging
+from typing import Any
+
+from aiohttp import web
+
+from .trace import load_trace
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TraceReplayServer:
+    """Answers requests from a trace in recorded order, per method and path."""
+
+    def __init__(self, records: list[dict[str, Any]], speed: float = 1.0) -> None:
+        self._speed = speed
+        # One queue per method and path without query string; every record is
+        # in exactly one queue.
+        self._queues: dict[tuple[str, str], deque[dict[str, Any]]] = defaultdict(deque)
+        for record in records:
+            base = record["path"].split("?", 1)[0]
+            self._queues[(record["method"], base)].append(record)
+
+    def _next(self, method: str, path_qs: str, path: str) -> dict[str, Any] | None:
+        queue = self._queues.get((method, path))
+        if not queue:
+            return None
+        # Prefer the oldest record with the same query string (e.g. a task id),
+        # else the oldest for the path (e.g. a task id the replay made up).
+        record = next((r for r in queue if r["path"] == path_qs), queue[0])
+        # Keep the last record so repeated polling still gets answers.
+        if len(queue) > 1:
+            queue.remove(record)
+        return record
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        if request.can_read_body:
+            await request.read()
+
+        record = self._next(request.method, request.path_qs, request.path)
+        if record is None:
+            _LOGGER.warning("No recorded response for %s %s", request.method, request.path_qs)
+            return web.Response(status=404)
+
+        if self._speed > 0:
+            await asyncio.sleep(record["duration"] / self._speed)
+
+        status = record.get("status")
+        if status is None:
+            # The original request failed without a response (timeout, reset, ...).
+            return web.Response(status=503, text=record.get("error") or "")
+        body = record.get("body")
+        if status == 204:
+            return web.Response(status=204)
+        if isinstance(body, str):
+            return web.Response(status=status, text=body)
+        if body is not None:
+            return web.json_response(body, status=status)
+        size = record.get("size") or 0
+        if request.method != "GET":
+            size = 0
+        return web.Response(status=status, body=bytes(size), content_type="application/octet-stream")
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=1024**3)
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded QDoxie request trace.")
+    parser.add_argument("trace", help="Trace file written by the record_trace service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--speed", type=float, default=1.0, help="Latency divisor; 0 disables delays")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    header, records = load_trace(args.trace)
+    _LOGGER.info("Replaying %s requests recorded at %s", len(records), header.get("recorded_at"))
+    server = TraceReplayServer(records, speed=args.speed)
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any, Callable
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfDataRate
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -14,6 +21,9 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 from .coordinator import DoxiePaperlessCoordinator
 
+# Only used by the polling sensors below; coordinator sensors follow the coordinator.
+SCAN_INTERVAL = timedelta(seconds=10)
+
 
 @dataclass(frozen=True)
 class DoxieSensorEntityDescription(SensorEntityDescription):
@@ -69,6 +79,11 @@ async def async_setup_entry(
     # One extra sensor that exposes the hello.json payload as attributes.
     entities.append(DoxieHelloSensor(coordinator, entry))
 
+    entities.append(DoxieDownloadConcurrencySensor(coordinator, entry))
+
+    if coordinator.upload_limiter:
+        entities.append(PaperlessUploadThroughputSensor(coordinator, entry))
+
     async_add_entities(entities)
 
 
@@ -115,3 +130,56 @@ class DoxieHelloSensor(CoordinatorEntity[DoxiePaperlessCoordinator], SensorEntit
         if not isinstance(hello, dict):
             return {}
         return {k: hello.get(k) for k in HELLO_ATTRS if k in hello}
+
+
+class DoxieDownloadConcurrencySensor(SensorEntity):
+    """Current limit of the adaptive Doxie download concurrency."""
+
+    _attr_icon = "mdi:speedometer"
+    _attr_name = "Doxie Download Concurrency"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: DoxiePaperlessCoordinator, entry: ConfigEntry) -> None:
+        self._controller = coordinator.download_concurrency
+        self._attr_unique_id = f"{entry.entry_id}_download_concurrency"
+
+    @property
+    def native_value(self) -> int:
+        return self._controller.limit
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        latency = self._controller.latency
+        return {
+            "in_flight": self._controller.in_flight,
+            "max_limit": self._controller.max_limit,
+            "latency_s": round(latency, 3) if latency is not None else None,
+        }
+
+
+class PaperlessUploadThroughputSensor(SensorEntity):
+    """Current Paperless upload throughput, polled from the shared rate limiter."""
+
+    _attr_icon = "mdi:upload-network"
+    _attr_name = "Paperless Upload Throughput"
+    _attr_device_class = SensorDeviceClass.DATA_RATE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfDataRate.KIBIBYTES_PER_SECOND
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: DoxiePaperlessCoordinator, entry: ConfigEntry) -> None:
+        self._limiter = coordinator.upload_limiter
+        self._attr_unique_id = f"{entry.entry_id}_upload_throughput"
+
+    @property
+    def native_value(self) -> float | None:
+        if not self._limiter:
+            return None
+        return round(self._limiter.throughput / 1024, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if not self._limiter:
+            return {}
+        rate = self._limiter.rate
+        return {"limit_kib_s": round(rate / 1024, 1) if rate else None}
@@ -0,0 +1,65 @@
+"""Per-request timing hooks shared by the Doxie and Paperless API clients."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestTiming:
+    client: str
+    method: str
+    path: str
+    status: int | None = None
+    size: int | None = None
+    duration: float = 0.0
+    error: str | None = None
+    started: float = 0.0
+    # Decoded JSON/text response, only kept for trace recording.
+    body: Any = field(default=None, repr=False)
+
+
+RequestListener = Callable[[RequestTiming], None]
+
+
+class RequestTimer:
+    """Times client requests and hands the result to registered listeners."""
+
+    def __init__(self, client: str) -> None:
+        self._client = client
+        self._listeners: list[RequestListener] = []
+
+    def add_listener(self, listener: RequestListener) -> Callable[[], None]:
+        """Register a listener; returns a callable that removes it again."""
+        self._listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    @contextmanager
+    def track(self, method: str, path: str) -> Iterator[RequestTiming]:
+        """Time one request. The caller fills in status/size on the yielded record."""
+        record = RequestTiming(client=self._client, method=method, path=path, started=time.time())
+        start = time.monotonic()
+        try:
+            yield record
+        except BaseException as err:
+            record.error = type(err).__name__
+            raise
+        finally:
+            record.duration = time.monotonic() - start
+            for listener in list(self._listeners):
+                try:
+                    listener(record)
+                except Exception:  # noqa: BLE001
+                    _LOGGER.exception("Request listener failed")
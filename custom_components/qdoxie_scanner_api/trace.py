@@ -0,0 +1,127 @@
+"""Request trace recording for offline replay (see replay.py).
+
+A trace is a gzip'd JSON-lines file: one header line followed by one line per
+request with method, path, status, size and duration. Binary payloads (scan
+downloads, upload bodies) are never stored, only their size; JSON/text
+responses are kept with identifying fields redacted so the replay server can
+serve realistically shaped answers. Names in metadata lookup query strings
+are redacted too; the replay server answers those by path.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import asdict
+from datetime import datetime, timezone
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from .const import DOXIE_IDENTITY_KEYS
+from .timing import RequestTiming
+
+TRACE_FORMAT = "qdoxie-trace"
+TRACE_VERSION = 1
+
+REDACTED = "**REDACTED**"
+# Keys redacted per endpoint (path without query string): the Doxie's
+# identity in hello.json, the document names in Paperless task details and
+# the names, match patterns and owners of Paperless metadata objects. Scan
+# paths stay intact so replays can fetch them.
+_METADATA_KEYS = {"name", "slug", "match", "owner", "permissions", "set_permissions"}
+REDACT_KEYS = {
+    "/hello.json": DOXIE_IDENTITY_KEYS,
+    "/api/tasks/": {"task_file_name", "result"},
+    "/api/tags/": _METADATA_KEYS,
+    "/api/correspondents/": _METADATA_KEYS,
+    "/api/document_types/": _METADATA_KEYS,
+    "/api/storage_paths/": _METADATA_KEYS | {"path"},
+}
+# Query parameters redacted in recorded paths (metadata lookups by name).
+REDACT_QUERY = {"name__iexact"}
+
+MAX_RECORDS = 5000
+
+
+def _redact_keys(data: Any, keys: Collection[str]) -> Any:
+    if isinstance(data, dict):
+        return {k: REDACTED if k in keys else _redact_keys(v, keys) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_redact_keys(v, keys) for v in data]
+    return data
+
+
+def redact_path(path: str) -> str:
+    """Redact the values of REDACT_QUERY parameters in a request path."""
+    base, sep, query = path.partition("?")
+    if not sep:
+        return path
+    params = [(k, REDACTED if k in REDACT_QUERY else v) for k, v in parse_qsl(query, keep_blank_values=True)]
+    return f"{base}?{urlencode(params)}"
+
+
+def redact(path: str, data: Any) -> Any:
+    """Redact the identifying fields of a response body recorded for `path`."""
+    base = path.split("?", 1)[0]
+    keys = REDACT_KEYS.get(base)
+    if keys is None:
+        return data
+    return _redact_keys(data, keys)
+
+
+class TraceRecorder:
+    """Records requests of the next N sync cycles into a trace file."""
+
+    def __init__(self, path: Path, cycles: int) -> None:
+        self.path = path
+        self.cycles = cycles
+        self.completed_cycles = 0
+        self.records: list[dict[str, Any]] = []
+        self._t0: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.completed_cycles < self.cycles
+
+    def record(self, timing: RequestTiming) -> None:
+        if not self.active or len(self.records) >= MAX_RECORDS:
+            return
+        if self._t0 is None:
+            self._t0 = timing.started
+        data = asdict(timing)
+        data["offset"] = round(timing.started - self._t0, 4)
+        data["duration"] = round(timing.duration, 4)
+        del data["started"]
+        data["path"] = redact_path(timing.path)
+        data["body"] = redact(timing.path, timing.body)
+        self.records.append(data)
+
+    def stop_cycle(self) -> None:
+        self.completed_cycles += 1
+
+    def write(self) -> Path:
+        """Write the trace file (blocking; run in the executor)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "format": TRACE_FORMAT,
+            "version": TRACE_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "cycles": self.completed_cycles,
+        }
+        with gzip.open(self.path, "wt", encoding="utf-8") as fh:
+            for line in (header, *self.records):
+                fh.write(json.dumps(line, separators=(",", ":")) + "\n")
+        return self.path
+
+
+def load_trace(path: str | Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read a trace file; returns (header, records)."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh if line.strip()]
+    if not lines or lines[0].get("format") != TRACE_FORMAT:
+        raise ValueError(f"{path} is not a {TRACE_FORMAT} file")
+    if lines[0].get("version") != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version: {lines[0].get('version')}")
+    return lines[0], lines[1:]